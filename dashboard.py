@@ -8,14 +8,29 @@ import sqlite3
 import os
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 DB_PATH = os.environ.get("DEV_TRACKER_DB", Path.home() / "dev-tracker" / "dev_tracker.db")
 HOURLY_RATE = float(os.environ.get("DEV_TRACKER_HOURLY_RATE", "75"))
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# WAL lets the dashboard read while the hooks write; 64 MB cache, 256 MB mmap
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA busy_timeout = 5000;
+"""
 
 def get_db():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    conn.executescript(CONNECTION_PRAGMAS)
+    # Idempotent; picks up tables/indexes added since the DB was created
+    if SCHEMA_PATH.exists():
+        conn.executescript(SCHEMA_PATH.read_text())
     return conn
 
 def format_duration(hours):
@@ -30,6 +45,7 @@ def main():
     
     conn = get_db()
     cur = conn.cursor()
+    since = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
     
     print("\n" + "="*60)
     print("📊 DEVELOPMENT TRACKER DASHBOARD")
@@ -45,8 +61,8 @@ def main():
             SUM(total_insertions) as adds,
             SUM(total_deletions) as dels
         FROM daily_summaries
-        WHERE date >= date('now', ?)
-    """, (f"-{days} days",))
+        WHERE date >= ?
+    """, (since,))
     
     row = cur.fetchone()
     hours = row['hours'] or 0
@@ -73,15 +89,15 @@ def main():
     cur.execute("""
         SELECT 
             COALESCE(pm.project_name, 'Unlinked') as project,
-            SUM(ds.total_dev_hours) as hours,
-            SUM(ds.total_commits) as commits
-        FROM daily_summaries ds
-        LEFT JOIN project_mappings pm ON ds.project_api_key = pm.project_api_key
-        WHERE ds.date >= date('now', ?)
-        GROUP BY pm.project_name
-        ORDER BY hours DESC
+            SUM(mv.hours) as hours,
+            SUM(mv.commits) as commits
+        FROM mv_project_daily mv
+        LEFT JOIN project_mappings pm USING (project_api_key)
+        WHERE mv.date >= ?
+        GROUP BY 1
+        ORDER BY hours DESC, project
         LIMIT 5
-    """, (f"-{days} days",))
+    """, (since,))
     
     projects = cur.fetchall()
     if projects:
@@ -23,6 +23,25 @@ DB_PATH = os.environ.get(
     Path.home() / "dev-tracker" / "dev_tracker.db"
 )
 
+# Cache for GitHub/Roadmap API responses
+HTTP_CACHE_PATH = os.environ.get(
+    "DEV_TRACKER_HTTP_CACHE",
+    Path.home() / "dev-tracker" / "http_cache.db"
+)
+HTTP_CACHE_TTL = 300  # Seconds before a cached response is revalidated
+HTTP_CACHE_RETENTION_DAYS = 30  # Drop cached responses unused for N days
+
+# Origins allowed to call the API cross-origin (comma-separated). The
+# dashboard itself is served same-origin and doesn't need an entry.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "DEV_TRACKER_CORS_ORIGINS",
+        "http://localhost:8080,http://127.0.0.1:8080"
+    ).split(",")
+    if origin.strip()
+]
+
 # ROI Calculation defaults
 DEFAULT_HOURLY_RATE = 75
 DEFAULT_MULTIPLIER = 2.5
@@ -30,3 +49,4 @@ DEFAULT_MULTIPLIER = 2.5
 # Data collection settings
 DEFAULT_DAYS = 30
 REPO_ACTIVITY_DAYS = 90  # Only include repos active in last N days
+GITHUB_CONCURRENCY = 15  # Max in-flight GitHub API requests
@@ -4,50 +4,193 @@ Data Collector for Development Tracker Dashboard
 Aggregates data from SQLite, GitHub API, and Roadmap API
 """
 
+import asyncio
+import atexit
 import json
+import os
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import httpx
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib encoder
+    orjson = None
+
 from config import (
     GITHUB_TOKEN, GITHUB_API_BASE, GITHUB_USERNAME,
     ROADMAP_API_TOKEN, ROADMAP_API_BASE,
     DB_PATH, DEFAULT_HOURLY_RATE, DEFAULT_MULTIPLIER,
-    DEFAULT_DAYS, REPO_ACTIVITY_DAYS
+    DEFAULT_DAYS, REPO_ACTIVITY_DAYS, GITHUB_CONCURRENCY,
+    HTTP_CACHE_PATH, HTTP_CACHE_TTL, HTTP_CACHE_RETENTION_DAYS
 )
 
 
+# Shared connection, opened lazily and kept for the life of the process so
+# repeated dashboard refreshes reuse SQLite's page cache. DB_LOCK serializes
+# access since the connection is shared across threads.
+_CONN = None
+_CURSOR = None
+DB_LOCK = threading.Lock()
+
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA busy_timeout = 5000;
+"""
+
+# schema.sql is idempotent; applying it on connect brings databases created
+# from an older schema up to date (indexes, rollup table and triggers).
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+
 def get_db_connection():
-    """Get SQLite database connection"""
+    """Get the shared SQLite database connection"""
+    global _CONN, _CURSOR
+    if _CONN is not None:
+        return _CONN
     if not Path(DB_PATH).exists():
         return None
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def query_db(sql: str, params: tuple = ()) -> list:
+    with DB_LOCK:
+        if _CONN is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn.executescript(CONNECTION_PRAGMAS)
+            if SCHEMA_PATH.exists():
+                conn.executescript(SCHEMA_PATH.read_text())
+            # Refresh planner statistics only where they are stale
+            conn.execute("PRAGMA optimize")
+            atexit.register(conn.close)
+            _CURSOR = conn.cursor()
+            _CONN = conn
+    return _CONN
+
+
+def query_db(sql: str, params: tuple | dict = ()) -> list:
     """Execute a query and return results as list of dicts"""
     conn = get_db_connection()
     if not conn:
         return []
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with DB_LOCK:
+        _CURSOR.execute(sql, params)
+        cols = [d[0] for d in _CURSOR.description]
+        return [dict(zip(cols, row)) for row in _CURSOR.fetchall()]
+
+
+# =============================================================================
+# HTTP Response Cache
+# =============================================================================
+
+# GET responses from GitHub and Roadmap, keyed by URL. Entries younger than
+# HTTP_CACHE_TTL are served without a request; older ones are revalidated
+# with If-None-Match so an unchanged resource costs only a 304.
+_HTTP_CACHE = None
+HTTP_CACHE_LOCK = threading.Lock()
+
+
+def get_http_cache():
+    """Get the shared HTTP cache connection, creating the cache file if needed"""
+    global _HTTP_CACHE
+    with HTTP_CACHE_LOCK:
+        if _HTTP_CACHE is None:
+            Path(HTTP_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(HTTP_CACHE_PATH, check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    body TEXT NOT NULL,
+                    fetched_at INTEGER NOT NULL
+                )
+            """)
+            # Drop entries nothing has touched within the retention window
+            with conn:
+                conn.execute(
+                    "DELETE FROM http_cache WHERE fetched_at < ?",
+                    (int(time.time()) - HTTP_CACHE_RETENTION_DAYS * 86400,)
+                )
+            atexit.register(conn.close)
+            _HTTP_CACHE = conn
+    return _HTTP_CACHE
+
+
+def http_cache_get(url: str) -> dict | None:
+    """Look up a cached response: {'etag', 'body', 'fresh'} or None"""
+    conn = get_http_cache()
+    with HTTP_CACHE_LOCK:
+        row = conn.execute(
+            "SELECT etag, body, fetched_at FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+    if not row:
+        return None
+    etag, body, fetched_at = row
+    return {
+        "etag": etag,
+        "body": json.loads(body),
+        "fresh": time.time() - fetched_at < HTTP_CACHE_TTL
+    }
+
+
+def http_cache_put(url: str, etag: str | None, body) -> None:
+    """Store (or refresh the timestamp of) a cached response"""
+    conn = get_http_cache()
+    with HTTP_CACHE_LOCK, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO http_cache (url, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, etag, json.dumps(body), int(time.time()))
+        )
+
+
+def conditional_headers(headers: dict, cached: dict | None) -> dict:
+    """Add If-None-Match for a cached entry so the server can answer 304"""
+    if cached and cached['etag']:
+        return {**headers, "If-None-Match": cached['etag']}
+    return headers
+
+
+def handle_cached_response(url: str, response: httpx.Response, cached: dict | None):
+    """Resolve a (possibly 304) response against the cache, storing fresh bodies"""
+    if response.status_code == 304 and cached:
+        http_cache_put(url, cached['etag'], cached['body'])
+        return cached['body']
+    if response.status_code == 200:
+        body = response.json()
+        http_cache_put(url, response.headers.get('ETag'), body)
+        return body
+    return None
 
 
 # =============================================================================
 # SQLite Data Functions
 # =============================================================================
 
-def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
-    """Get development statistics from local SQLite database"""
+def get_period_bounds(days: int) -> dict:
+    """Get the date/timestamp lower bounds for the last N days as bind params
+
+    Binding literal bounds keeps filters as plain range scans on the
+    indexed date/timestamp columns.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    return {
+        "since_date": cutoff.date().isoformat(),
+        "since_ts": int(cutoff.replace(tzinfo=timezone.utc).timestamp())
+    }
+
 
-    # Get daily summaries
-    daily = query_db("""
+# Every dashboard section in a single round trip. Each row is one section
+# (daily, totals, commits, mappings, active) with its rows pre-serialized as
+# JSON by SQLite. Kept as one constant string so the connection's statement
+# cache serves the prepared statement on every refresh.
+SQLITE_STATS_SQL = """
+    WITH
+    daily AS (
         SELECT
             date,
             SUM(total_dev_hours) as hours,
@@ -55,85 +198,98 @@ def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
             SUM(total_commits) as commits,
             SUM(total_insertions) as insertions,
             SUM(total_deletions) as deletions,
-            AVG(commits_per_hour) as commits_per_hour,
-            AVG(lines_per_hour) as lines_per_hour
+            SUM(commits_per_hour) as commits_per_hour_sum,
+            COUNT(commits_per_hour) as commits_per_hour_count,
+            SUM(lines_per_hour) as lines_per_hour_sum,
+            COUNT(lines_per_hour) as lines_per_hour_count
         FROM daily_summaries
-        WHERE date >= date('now', ?)
+        WHERE date >= :since_date
         GROUP BY date
-        ORDER BY date DESC
-    """, (f"-{days} days",))
-
-    # Get totals
-    totals = query_db("""
+    ),
+    recent_commits AS (
         SELECT
-            SUM(total_dev_hours) as total_hours,
-            SUM(active_coding_hours) as active_hours,
-            SUM(total_commits) as commits,
-            SUM(total_insertions) as insertions,
-            SUM(total_deletions) as deletions,
-            AVG(commits_per_hour) as avg_commits_hr,
-            AVG(lines_per_hour) as avg_lines_hr
-        FROM daily_summaries
-        WHERE date >= date('now', ?)
-    """, (f"-{days} days",))
-
-    # Get recent commits from local DB
-    commits = query_db("""
-        SELECT
-            commit_hash,
-            repo_path,
-            message,
-            author,
-            datetime(timestamp, 'unixepoch') as timestamp,
-            insertions,
-            deletions,
-            branch,
-            pushed_to_roadmap
-        FROM commits
-        WHERE timestamp >= strftime('%s', 'now', ?)
-        ORDER BY timestamp DESC
+            c.commit_hash,
+            c.repo_path,
+            c.message,
+            c.author,
+            datetime(c.timestamp, 'unixepoch') as timestamp,
+            c.insertions,
+            c.deletions,
+            c.branch,
+            c.pushed_to_roadmap,
+            g.gap_minutes,
+            -- Last path component, i.e. Path(repo_path).name
+            COALESCE(NULLIF(substr(
+                c.repo_path,
+                length(rtrim(c.repo_path, replace(c.repo_path, '/', ''))) + 1
+            ), ''), 'unknown') as repo
+        FROM commits c
+        LEFT JOIN v_commit_gaps g ON g.commit_hash = c.commit_hash
+        WHERE c.timestamp >= :since_ts
+        ORDER BY c.timestamp DESC
         LIMIT 50
-    """, (f"-{days} days",))
+    )
+    SELECT 'daily' as section, json_group_array(json_object(
+        'date', date,
+        'hours', hours,
+        'active_hours', active_hours,
+        'commits', commits,
+        'insertions', insertions,
+        'deletions', deletions
+    )) as payload
+    FROM (SELECT * FROM daily ORDER BY date DESC)
+    UNION ALL
+    SELECT 'totals', json_object(
+        'total_hours', SUM(hours),
+        'active_hours', SUM(active_hours),
+        'commits', SUM(commits),
+        'insertions', SUM(insertions),
+        'deletions', SUM(deletions),
+        'avg_commits_hr', SUM(commits_per_hour_sum) / SUM(commits_per_hour_count),
+        'avg_lines_hr', SUM(lines_per_hour_sum) / SUM(lines_per_hour_count)
+    )
+    FROM daily
+    UNION ALL
+    SELECT 'commits', json_group_array(json_object(
+        'commit_hash', commit_hash,
+        'repo_path', repo_path,
+        'message', message,
+        'author', author,
+        'timestamp', timestamp,
+        'insertions', insertions,
+        'deletions', deletions,
+        'branch', branch,
+        'pushed_to_roadmap', pushed_to_roadmap,
+        'gap_minutes', gap_minutes,
+        'repo', repo
+    ))
+    FROM recent_commits
+    UNION ALL
+    SELECT 'mappings', json_group_array(json_object(
+        'repo_path', repo_path,
+        'project_api_key', project_api_key,
+        'project_name', project_name,
+        'auto_push_updates', auto_push_updates
+    ))
+    FROM project_mappings
+    UNION ALL
+    SELECT 'active', json(COUNT(*))
+    FROM sessions
+    WHERE status = 'active'
+"""
 
-    # Get commit gaps
-    gaps = query_db("""
-        SELECT
-            commit_hash,
-            gap_minutes
-        FROM v_commit_gaps
-        WHERE commit_time >= strftime('%s', 'now', ?)
-        ORDER BY commit_time DESC
-    """, (f"-{days} days",))
-
-    gap_map = {g['commit_hash']: g['gap_minutes'] for g in gaps}
-
-    # Add gap info to commits
-    for c in commits:
-        c['gap_minutes'] = gap_map.get(c['commit_hash'])
-        # Extract repo name from path
-        if c['repo_path']:
-            c['repo'] = Path(c['repo_path']).name
-        else:
-            c['repo'] = 'unknown'
 
-    # Get project mappings
-    mappings = query_db("""
-        SELECT
-            repo_path,
-            project_api_key,
-            project_name,
-            auto_push_updates
-        FROM project_mappings
-    """)
-
-    # Get active sessions
-    active = query_db("""
-        SELECT COUNT(*) as count
-        FROM sessions
-        WHERE status = 'active'
-    """)
-
-    t = totals[0] if totals else {}
+def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
+    """Get development statistics from local SQLite database"""
+
+    rows = query_db(SQLITE_STATS_SQL, get_period_bounds(days))
+
+    loads = orjson.loads if orjson else json.loads
+    sections = {row['section']: loads(row['payload']) for row in rows}
+    daily = sections.get('daily', [])
+    mappings = sections.get('mappings', [])
+
+    t = sections.get('totals', {})
 
     return {
         "daily_activity": [
@@ -155,7 +311,7 @@ def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
             "avg_commits_hr": round(t.get('avg_commits_hr') or 0, 2),
             "avg_lines_hr": round(t.get('avg_lines_hr') or 0, 0)
         },
-        "commits": commits,
+        "commits": sections.get('commits', []),
         "project_mappings": [
             {
                 "repo_path": m['repo_path'],
@@ -166,7 +322,7 @@ def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
             }
             for m in mappings
         ],
-        "active_sessions": active[0]['count'] if active else 0
+        "active_sessions": sections.get('active', 0)
     }
 
 
@@ -174,29 +330,98 @@ def get_sqlite_stats(days: int = DEFAULT_DAYS) -> dict:
 # GitHub API Functions
 # =============================================================================
 
+GITHUB_HEADERS = {
+    "Authorization": f"Bearer {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github.v3+json"
+}
+
+# Keep-alive client reused by every synchronous GitHub call, so sequential
+# requests skip the TCP/TLS handshake
+github_client = httpx.Client(
+    base_url=GITHUB_API_BASE,
+    headers=GITHUB_HEADERS,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+)
+atexit.register(github_client.close)
+
+
 def github_request(endpoint: str) -> dict | list | None:
     """Make a request to the GitHub API"""
     if not GITHUB_TOKEN:
         return None
 
-    headers = {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    url = f"{GITHUB_API_BASE}{endpoint}"
+    cached = http_cache_get(url)
+    if cached and cached['fresh']:
+        return cached['body']
 
     try:
-        response = httpx.get(
-            f"{GITHUB_API_BASE}{endpoint}",
-            headers=headers,
-            timeout=30
+        response = github_client.get(
+            endpoint, headers=conditional_headers({}, cached)
         )
-        if response.status_code == 200:
-            return response.json()
-        return None
+        return handle_cached_response(url, response, cached)
     except Exception:
         return None
 
 
+# Recent default-branch commits with their line stats, one query per repo
+GITHUB_COMMITS_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: $since, first: 50) {
+            nodes {
+              oid
+              message
+              authoredDate
+              additions
+              deletions
+              author { name }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+async def github_graphql_async(
+    client: httpx.AsyncClient,
+    query: str,
+    variables: dict,
+    sem: asyncio.Semaphore
+) -> dict | None:
+    """Run a GitHub GraphQL query on a shared async client
+
+    GraphQL has no conditional requests, so responses are cached for
+    HTTP_CACHE_TTL only.
+    """
+    cache_key = f"{GITHUB_API_BASE}/graphql?{json.dumps(variables, sort_keys=True)}"
+    cached = http_cache_get(cache_key)
+    if cached and cached['fresh']:
+        return cached['body']
+
+    async with sem:
+        try:
+            response = await client.post(
+                "/graphql", json={"query": query, "variables": variables}
+            )
+            if response.status_code != 200:
+                return None
+            body = response.json()
+            if body.get('errors'):
+                return None
+            http_cache_put(cache_key, None, body['data'])
+            return body['data']
+        except Exception:
+            return None
+
+
 def get_github_repos() -> list:
     """Auto-discover repos from GitHub, filter to recently active"""
     repos = github_request(f"/users/{GITHUB_USERNAME}/repos?sort=pushed&per_page=100")
@@ -225,74 +450,114 @@ def get_github_repos() -> list:
     return active_repos
 
 
-def get_github_commits(repos: list, days: int = DEFAULT_DAYS) -> list:
-    """Fetch recent commits from GitHub repos"""
+async def get_github_commits(repos: list, days: int = DEFAULT_DAYS) -> list:
+    """Fetch recent commits from GitHub repos
+
+    One GraphQL query per repo returns its commits with additions/deletions
+    attached. Queries run concurrently over one pooled client, bounded by
+    GITHUB_CONCURRENCY.
+    """
     if not GITHUB_TOKEN:
         return []
 
-    since = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
-    all_commits = []
-
-    for repo in repos[:10]:  # Limit to 10 repos to avoid rate limits
-        repo_name = repo['full_name'] if isinstance(repo, dict) else repo
-
-        commits = github_request(
-            f"/repos/{repo_name}/commits?since={since}&per_page=50"
+    # Truncated to the hour so the query variables stay stable for the cache
+    since = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%dT%H:00:00Z")
+    repo_names = [
+        repo['full_name'] if isinstance(repo, dict) else repo
+        for repo in repos[:10]  # Limit to 10 repos to avoid rate limits
+    ]
+    sem = asyncio.Semaphore(GITHUB_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        base_url=GITHUB_API_BASE,
+        headers=GITHUB_HEADERS,
+        timeout=30,
+        limits=httpx.Limits(
+            max_connections=GITHUB_CONCURRENCY,
+            max_keepalive_connections=GITHUB_CONCURRENCY
         )
+    ) as client:
+        results = await asyncio.gather(*(
+            github_graphql_async(client, GITHUB_COMMITS_QUERY, {
+                "owner": repo_name.split('/')[0],
+                "name": repo_name.split('/')[-1],
+                "since": since
+            }, sem)
+            for repo_name in repo_names
+        ))
 
-        if commits:
-            for c in commits:
-                # Get detailed commit info for stats
-                detail = github_request(f"/repos/{repo_name}/commits/{c['sha']}")
-                stats = detail.get('stats', {}) if detail else {}
-
-                all_commits.append({
-                    "hash": c['sha'][:8],
-                    "full_hash": c['sha'],
-                    "repo": repo_name.split('/')[-1],
-                    "message": c['commit']['message'].split('\n')[0],
-                    "timestamp": c['commit']['author']['date'],
-                    "author": c['commit']['author']['name'],
-                    "additions": stats.get('additions', 0),
-                    "deletions": stats.get('deletions', 0)
-                })
+    all_commits = []
+    for repo_name, result in zip(repo_names, results):
+        try:
+            history = result['repository']['defaultBranchRef']['target']['history']
+        except (TypeError, KeyError):
+            continue  # Request failed, or the repo is empty
+
+        for c in history['nodes']:
+            all_commits.append({
+                "hash": c['oid'][:8],
+                "full_hash": c['oid'],
+                "repo": repo_name.split('/')[-1],
+                "message": c['message'].split('\n')[0],
+                "timestamp": c['authoredDate'],
+                "author": (c.get('author') or {}).get('name'),
+                "additions": c.get('additions', 0),
+                "deletions": c.get('deletions', 0)
+            })
 
     # Sort by timestamp and calculate gaps
     all_commits.sort(key=lambda x: x['timestamp'], reverse=True)
 
-    for i, commit in enumerate(all_commits):
-        if i < len(all_commits) - 1:
-            curr = datetime.fromisoformat(commit['timestamp'].replace('Z', '+00:00'))
-            prev = datetime.fromisoformat(all_commits[i + 1]['timestamp'].replace('Z', '+00:00'))
-            gap = (curr - prev).total_seconds() / 60
-            commit['gap_minutes'] = round(gap, 1)
-        else:
-            commit['gap_minutes'] = None
+    # Parse each timestamp once, and only for the commits returned plus the
+    # one after them (needed for the last gap)
+    recent = all_commits[:50]
+    times = [
+        datetime.fromisoformat(c['timestamp'].replace('Z', '+00:00'))
+        for c in all_commits[:51]
+    ]
 
-    return all_commits[:50]
+    for commit, curr, prev in zip(recent, times, times[1:]):
+        commit['gap_minutes'] = round((curr - prev).total_seconds() / 60, 1)
+    if len(times) == len(recent) and recent:
+        recent[-1]['gap_minutes'] = None
+
+    return recent
 
 
 # =============================================================================
 # Roadmap API Functions
 # =============================================================================
 
+roadmap_client = httpx.Client(
+    base_url=ROADMAP_API_BASE,
+    headers={
+        "Authorization": f"Bearer {ROADMAP_API_TOKEN}",
+        "Content-Type": "application/json"
+    },
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+)
+atexit.register(roadmap_client.close)
+
+
 def roadmap_request(method: str, endpoint: str, data: dict = None) -> dict | None:
     """Make a request to the Roadmap API"""
     if not ROADMAP_API_TOKEN:
         return None
 
-    headers = {
-        "Authorization": f"Bearer {ROADMAP_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
-
     url = f"{ROADMAP_API_BASE}{endpoint}"
 
     try:
         if method == "GET":
-            response = httpx.get(url, headers=headers, timeout=30)
+            cached = http_cache_get(url)
+            if cached and cached['fresh']:
+                return cached['body']
+            response = roadmap_client.get(
+                endpoint, headers=conditional_headers({}, cached)
+            )
+            return handle_cached_response(url, response, cached)
         elif method == "POST":
-            response = httpx.post(url, headers=headers, json=data, timeout=30)
+            response = roadmap_client.post(endpoint, json=data)
         else:
             return None
 
@@ -382,17 +647,23 @@ def calculate_roi(
 # =============================================================================
 
 def generate_dashboard_data(days: int = DEFAULT_DAYS) -> dict:
-    """Generate complete dashboard data from all sources"""
-
-    # Get SQLite data
-    sqlite_data = get_sqlite_stats(days)
-
-    # Get GitHub data
-    github_repos = get_github_repos()
-    github_commits = get_github_commits(github_repos, days) if github_repos else []
+    """Generate complete dashboard data from all sources
+
+    The sources are independent, so SQLite and the Roadmap API are queried
+    on worker threads while GitHub repos and commits are fetched here.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sqlite_future = executor.submit(get_sqlite_stats, days)
+        roadmap_future = executor.submit(get_roadmap_projects)
+
+        # Commits depend on the repo list, so GitHub stays on this thread
+        github_repos = get_github_repos()
+        github_commits = (
+            asyncio.run(get_github_commits(github_repos, days)) if github_repos else []
+        )
 
-    # Get Roadmap data
-    roadmap_projects = get_roadmap_projects()
+        sqlite_data = sqlite_future.result()
+        roadmap_projects = roadmap_future.result()
 
     # Calculate totals - prefer SQLite, fallback to GitHub
     totals = sqlite_data['totals']
@@ -421,11 +692,9 @@ def generate_dashboard_data(days: int = DEFAULT_DAYS) -> dict:
     avg_gap = sum(gaps) / len(gaps) if gaps else 0
 
     # Add repo counts to github_repos
+    commit_counts = Counter(c.get('repo') for c in github_commits)
     for repo in github_repos:
-        repo['commit_count_30d'] = len([
-            c for c in github_commits
-            if c.get('repo') == repo['name']
-        ])
+        repo['commit_count_30d'] = commit_counts[repo['name']]
 
     # Link roadmap projects to repos
     repo_project_map = {
@@ -433,12 +702,11 @@ def generate_dashboard_data(days: int = DEFAULT_DAYS) -> dict:
         for m in sqlite_data['project_mappings']
         if m['repo_path']
     }
+    project_repo_map = {}
+    for repo, pname in repo_project_map.items():
+        project_repo_map.setdefault(pname, repo)
     for project in roadmap_projects:
-        project['linked_repo'] = next(
-            (repo for repo, pname in repo_project_map.items()
-             if pname == project['name']),
-            None
-        )
+        project['linked_repo'] = project_repo_map.get(project['name'])
 
     data = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
@@ -486,10 +754,24 @@ def generate_dashboard_data(days: int = DEFAULT_DAYS) -> dict:
 
 
 def save_data(data: dict, filename: str = "live_data.json"):
-    """Save data to JSON file"""
+    """Save data to JSON file
+
+    Written to a temp file and swapped in, so the dashboard server never
+    reads a half-written file.
+    """
     output_path = Path(__file__).parent / filename
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    # Per-process name, so server workers refreshing at once don't share it
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    if orjson:
+        tmp_path.write_bytes(orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ))
+    else:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+    tmp_path.replace(output_path)
     print(f"Data saved to {output_path}")
 
 
@@ -39,9 +39,9 @@ source "$VENV_DIR/bin/activate"
 
 # Check for required Python packages
 echo "Checking dependencies..."
-python3 -c "import fastapi, uvicorn, httpx" 2>/dev/null || {
+python3 -c "import fastapi, uvicorn, uvloop, httptools, httpx, orjson" 2>/dev/null || {
     echo "Installing required packages..."
-    pip install fastapi uvicorn httpx --quiet
+    pip install fastapi "uvicorn[standard]" httpx orjson --quiet
 }
 echo "✓ Dependencies OK"
 echo ""
@@ -63,4 +63,5 @@ echo "Press Ctrl+C to stop"
 echo "========================================"
 echo ""
 
-python3 -m uvicorn server:app --host 0.0.0.0 --port 8080 --reload
+# Auto-reload by default here; DEV_MODE=0 runs WEB_WORKERS processes instead
+DEV_MODE="${DEV_MODE:-1}" python3 server.py
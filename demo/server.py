@@ -4,25 +4,48 @@ FastAPI Server for Development Tracker Dashboard
 Serves the dashboard and provides data API endpoints
 """
 
+import asyncio
 import json
 import csv
-import sqlite3
 import io
-from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
-from fastapi import FastAPI, Query
-from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import (
+    HTMLResponse, FileResponse, StreamingResponse, JSONResponse, ORJSONResponse,
+    Response
+)
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Development Tracker Dashboard")
+from config import CORS_ORIGINS
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+DefaultJSONResponse = ORJSONResponse if orjson else JSONResponse
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_data_cache()
+    yield
+
+
+app = FastAPI(
+    title="Development Tracker Dashboard",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan
+)
 
-# Enable CORS for local development
+# Enable CORS for local development. Origins are listed explicitly; the API
+# uses no cookies or auth headers, so credentials stay disabled.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
@@ -32,21 +55,96 @@ DEMO_DATA_PATH = BASE_DIR / "demo_data.json"
 LIVE_DATA_PATH = BASE_DIR / "live_data.json"
 DB_PATH = Path.home() / "dev-tracker" / "dev_tracker.db"
 
+# Rows fetched from SQLite per chunk of a streamed CSV export
+CSV_BATCH_SIZE = 500
+# Detail columns in each export row; the window totals follow them
+CSV_COLUMNS = 8
+
+# Data files larger than this are streamed from disk as written (both files
+# already carry their data_mode) instead of being parsed and held in memory
+STREAM_THRESHOLD_BYTES = 5 * 1024 * 1024
+
+# Serializes live data regeneration within a worker so refreshes don't
+# collect at once (save_data's atomic replace covers separate workers)
+_REFRESH_LOCK = asyncio.Lock()
+
+# Serialized /api/data payloads keyed by path, reused until the file changes
+_DATA_CACHE: dict[Path, dict] = {}
+
 
 def load_json_file(path: Path) -> dict:
     """Load and parse a JSON file"""
     if not path.exists():
         return {"error": f"File not found: {path.name}"}
+    if orjson:
+        return orjson.loads(path.read_bytes())
     with open(path) as f:
         return json.load(f)
 
 
+def data_file_etag(path: Path) -> tuple[tuple[int, int], str]:
+    """Get a (cache key, weak ETag) pair from a file's mtime and size"""
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    return key, f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def load_cached_payload(path: Path, mode: str, key: tuple[int, int]) -> bytes:
+    """Get the /api/data response body for a data file
+
+    The file is parsed and re-serialized (with data_mode set) only when its
+    mtime or size changes; otherwise the cached bytes are returned as-is.
+    """
+    entry = _DATA_CACHE.get(path)
+    if entry is None or entry["key"] != key:
+        data = load_json_file(path)
+        data["data_mode"] = mode
+        if orjson:
+            body = orjson.dumps(data)
+        else:
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        entry = _DATA_CACHE[path] = {"key": key, "body": body}
+    return entry["body"]
+
+
+def warm_data_cache():
+    """Serialize the existing data files up front
+
+    demo_data.json never changes at runtime, so even the first /api/data
+    request is served from cached bytes.
+    """
+    for path, mode in ((DEMO_DATA_PATH, "demo"), (LIVE_DATA_PATH, "live")):
+        if path.exists():
+            key, _ = data_file_etag(path)
+            if key[1] <= STREAM_THRESHOLD_BYTES:
+                load_cached_payload(path, mode, key)
+
+
+async def collect_live_data() -> dict:
+    """Regenerate live_data.json on a worker thread
+
+    Collection and the file write are both blocking (and collection runs
+    its own event loop for GitHub fetches), so neither runs on ours.
+    Concurrent refreshes wait for the one in progress.
+    """
+    from data_collector import generate_dashboard_data, save_data
+
+    def collect():
+        data = generate_dashboard_data()
+        save_data(data)
+        return data
+
+    async with _REFRESH_LOCK:
+        return await asyncio.to_thread(collect)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def serve_dashboard():
     """Serve the main dashboard HTML"""
     html_path = BASE_DIR / "index.html"
     if html_path.exists():
-        return html_path.read_text()
+        # Streamed without blocking the loop, with ETag/Last-Modified headers
+        return FileResponse(html_path, media_type="text/html")
     return "<h1>Dashboard not found</h1><p>Run setup first.</p>"
 
 
@@ -55,7 +153,7 @@ async def serve_steps():
     """Serve the How It Works documentation page"""
     html_path = BASE_DIR / "steps.html"
     if html_path.exists():
-        return html_path.read_text()
+        return FileResponse(html_path, media_type="text/html")
     return "<h1>Page not found</h1><p>steps.html not found.</p>"
 
 
@@ -73,38 +171,53 @@ async def download_steps_markdown():
 
 
 @app.get("/api/data")
-async def get_data(mode: str = Query("demo", pattern="^(demo|live)$")):
+async def get_data(
+    request: Request,
+    mode: str = Query("demo", pattern="^(demo|live)$")
+):
     """
     Get dashboard data
 
+    Responses carry a weak ETag derived from the data file, so polling
+    clients get an empty 304 until the file is regenerated.
+
     Args:
         mode: 'demo' for static demo data, 'live' for real data
     """
     if mode == "live":
-        data = load_json_file(LIVE_DATA_PATH)
-        if "error" in data:
+        path = LIVE_DATA_PATH
+        if not path.exists():
             # Try to generate live data
             try:
-                from data_collector import generate_dashboard_data, save_data
-                data = generate_dashboard_data()
-                save_data(data)
+                await collect_live_data()
             except Exception as e:
                 return {"error": f"Failed to generate live data: {str(e)}"}
-        data["data_mode"] = "live"
     else:
-        data = load_json_file(DEMO_DATA_PATH)
-        data["data_mode"] = "demo"
-
-    return data
+        path = DEMO_DATA_PATH
+        if not path.exists():
+            return load_json_file(path)
+
+    key, etag = data_file_etag(path)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if key[1] > STREAM_THRESHOLD_BYTES:
+        _DATA_CACHE.pop(path, None)
+        return FileResponse(path, media_type="application/json", headers=headers)
+
+    return Response(
+        content=load_cached_payload(path, mode, key),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @app.post("/api/refresh")
 async def refresh_data():
     """Re-run data collector and update live_data.json"""
     try:
-        from data_collector import generate_dashboard_data, save_data
-        data = generate_dashboard_data()
-        save_data(data)
+        data = await collect_live_data()
         return {
             "success": True,
             "message": "Data refreshed successfully",
@@ -165,74 +278,95 @@ async def export_csv(
 
     # Use real database
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
+        from data_collector import get_db_connection, get_period_bounds, DB_LOCK
+        conn = get_db_connection()
+        if conn is None:
+            return {"error": "Database not available"}
 
         # Query with phase and capitalization logic
-        cur.execute("""
-            SELECT
-                ds.date,
-                COALESCE(pm.project_name, 'Unlinked') as project_name,
-                COALESCE(pm.phase, 'unknown') as phase,
-                ds.total_dev_hours as hours,
-                ds.total_commits as commits,
-                ds.total_insertions as additions,
-                ds.total_deletions as deletions,
-                CASE
-                    WHEN pm.phase IN ('development', 'beta') THEN 'Yes'
-                    ELSE 'No'
-                END as capitalizable
-            FROM daily_summaries ds
-            LEFT JOIN project_mappings pm ON ds.repo_path = pm.repo_path
-            WHERE ds.date >= date('now', ?)
-            ORDER BY ds.date DESC, pm.project_name
-        """, (f"-{days} days",))
-
-        rows = cur.fetchall()
-        conn.close()
-
-        # Generate CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header
-        writer.writerow([
-            "Date", "Project", "Phase", "Hours", "Commits",
-            "Lines Added", "Lines Deleted", "Capitalizable"
-        ])
-
-        # Data rows
-        for row in rows:
+        with DB_LOCK:
+            cursor = conn.execute("""
+                SELECT
+                    ds.date,
+                    COALESCE(pm.project_name, 'Unlinked') as project_name,
+                    COALESCE(pm.phase, 'unknown') as phase,
+                    ROUND(COALESCE(ds.total_dev_hours, 0), 2) as hours,
+                    COALESCE(ds.total_commits, 0) as commits,
+                    COALESCE(ds.total_insertions, 0) as additions,
+                    COALESCE(ds.total_deletions, 0) as deletions,
+                    CASE
+                        WHEN pm.phase IN ('development', 'beta') THEN 'Yes'
+                        ELSE 'No'
+                    END as capitalizable,
+                    ROUND(COALESCE(SUM(ds.total_dev_hours) OVER (), 0), 2) as total_hours,
+                    COALESCE(SUM(ds.total_commits) OVER (), 0) as total_commits,
+                    COALESCE(SUM(ds.total_insertions) OVER (), 0) as total_additions,
+                    COALESCE(SUM(ds.total_deletions) OVER (), 0) as total_deletions,
+                    ROUND(COALESCE(SUM(CASE
+                        WHEN pm.phase IN ('development', 'beta') THEN ds.total_dev_hours
+                        ELSE 0
+                    END) OVER (), 0), 2) as cap_hours,
+                    ROUND(COALESCE(SUM(CASE
+                        WHEN pm.phase IN ('development', 'beta') THEN 0
+                        ELSE ds.total_dev_hours
+                    END) OVER (), 0), 2) as expensed_hours
+                FROM daily_summaries ds
+                LEFT JOIN project_mappings pm ON ds.repo_path = pm.repo_path
+                WHERE ds.date >= ?
+                ORDER BY ds.date DESC, pm.project_name
+            """, (get_period_bounds(days)["since_date"],))
+
+        def generate_csv():
+            """Yield the CSV a batch of rows at a time straight off the cursor"""
+            output = io.StringIO()
+            writer = csv.writer(output)
+
+            def flush() -> str:
+                data = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                return data
+
+            # Header
             writer.writerow([
-                row["date"],
-                row["project_name"],
-                row["phase"],
-                round(row["hours"] or 0, 2),
-                row["commits"] or 0,
-                row["additions"] or 0,
-                row["deletions"] or 0,
-                row["capitalizable"]
+                "Date", "Project", "Phase", "Hours", "Commits",
+                "Lines Added", "Lines Deleted", "Capitalizable"
             ])
+            yield flush()
 
-        # Add summary row
-        if rows:
-            total_hours = sum(r["hours"] or 0 for r in rows)
-            total_commits = sum(r["commits"] or 0 for r in rows)
-            total_additions = sum(r["additions"] or 0 for r in rows)
-            total_deletions = sum(r["deletions"] or 0 for r in rows)
-            cap_hours = sum(r["hours"] or 0 for r in rows if r["capitalizable"] == "Yes")
+            # Every row carries the period totals (window sums); keep the last
+            last = None
 
-            writer.writerow([])  # Empty row
-            writer.writerow(["TOTALS", "", "", round(total_hours, 2), total_commits,
-                           total_additions, total_deletions, ""])
-            writer.writerow(["Capitalizable Hours", "", "", round(cap_hours, 2), "", "", "", ""])
-            writer.writerow(["Expensed Hours", "", "", round(total_hours - cap_hours, 2), "", "", "", ""])
+            try:
+                while True:
+                    with DB_LOCK:
+                        rows = cursor.fetchmany(CSV_BATCH_SIZE)
+                    if not rows:
+                        break
+
+                    # Data rows: the first CSV_COLUMNS columns are already in
+                    # output order and formatted by the query
+                    writer.writerows(row[:CSV_COLUMNS] for row in rows)
+                    last = rows[-1]
+                    yield flush()
+            finally:
+                cursor.close()
+
+            # Add summary row
+            if last:
+                (total_hours, total_commits, total_additions, total_deletions,
+                 cap_hours, expensed_hours) = last[CSV_COLUMNS:]
+
+                writer.writerow([])  # Empty row
+                writer.writerow(["TOTALS", "", "", total_hours, total_commits,
+                               total_additions, total_deletions, ""])
+                writer.writerow(["Capitalizable Hours", "", "", cap_hours, "", "", "", ""])
+                writer.writerow(["Expensed Hours", "", "", expensed_hours, "", "", "", ""])
+                yield flush()
 
-        output.seek(0)
         filename = f"dev-tracker-export-{datetime.now().strftime('%Y%m%d')}.csv"
         return StreamingResponse(
-            iter([output.getvalue()]),
+            generate_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -264,10 +398,18 @@ async def get_config():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+
+    # DEV_MODE=1 runs a single auto-reloading process; otherwise serve with
+    # WEB_WORKERS processes (reload and workers are mutually exclusive)
+    dev_mode = os.environ.get("DEV_MODE", "").lower() in ("1", "true", "yes")
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8080,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        workers=1 if dev_mode else int(os.environ.get("WEB_WORKERS", "4")),
+        reload=dev_mode
     )
@@ -82,12 +82,22 @@ CREATE TABLE IF NOT EXISTS daily_summaries (
     UNIQUE(date, repo_path)
 );
 
+-- Project daily rollup: daily_summaries summed per (date, project), kept
+-- current by the triggers below so project breakdowns skip the raw rows
+CREATE TABLE IF NOT EXISTS mv_project_daily (
+    date TEXT NOT NULL,  -- YYYY-MM-DD
+    project_api_key TEXT NOT NULL DEFAULT '',  -- '' for repos not linked to a project
+    hours REAL DEFAULT 0,
+    commits INTEGER DEFAULT 0,
+    PRIMARY KEY (date, project_api_key)
+);
+
 -- Roadmap sync log: track what's been pushed to the API
 CREATE TABLE IF NOT EXISTS roadmap_sync_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     project_api_key TEXT NOT NULL,
     sync_type TEXT NOT NULL,  -- update, metrics, commit
-    payload TEXT,  -- JSON of what was sent
+    payload JSON,  -- What was sent; parsed on read by the MCP server
     response_status INTEGER,
     response_body TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
@@ -100,7 +110,55 @@ CREATE INDEX IF NOT EXISTS idx_tool_events_session ON tool_events(session_id);
 CREATE INDEX IF NOT EXISTS idx_commits_repo ON commits(repo_path);
 CREATE INDEX IF NOT EXISTS idx_commits_session ON commits(session_id);
 CREATE INDEX IF NOT EXISTS idx_commits_timestamp ON commits(timestamp);
+CREATE INDEX IF NOT EXISTS idx_commits_repo_timestamp ON commits(repo_path, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_daily_summaries_date ON daily_summaries(date);
+CREATE INDEX IF NOT EXISTS idx_daily_summaries_date_project ON daily_summaries(date, project_api_key);
+CREATE INDEX IF NOT EXISTS idx_daily_summaries_project_date ON daily_summaries(project_api_key, date);
+CREATE INDEX IF NOT EXISTS idx_daily_summaries_repo_date ON daily_summaries(repo_path, date DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(status) WHERE status = 'active';
+
+-- Keep mv_project_daily in sync. Each trigger rebuilds the rollup for the
+-- affected date(s) from daily_summaries, which also covers the implicit
+-- delete done by INSERT OR REPLACE.
+CREATE TRIGGER IF NOT EXISTS trg_daily_summaries_rollup_insert
+AFTER INSERT ON daily_summaries
+BEGIN
+    DELETE FROM mv_project_daily WHERE date = NEW.date;
+    INSERT INTO mv_project_daily (date, project_api_key, hours, commits)
+    SELECT date, COALESCE(project_api_key, ''), SUM(total_dev_hours), SUM(total_commits)
+    FROM daily_summaries
+    WHERE date = NEW.date
+    GROUP BY date, COALESCE(project_api_key, '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_summaries_rollup_update
+AFTER UPDATE ON daily_summaries
+BEGIN
+    DELETE FROM mv_project_daily WHERE date IN (OLD.date, NEW.date);
+    INSERT INTO mv_project_daily (date, project_api_key, hours, commits)
+    SELECT date, COALESCE(project_api_key, ''), SUM(total_dev_hours), SUM(total_commits)
+    FROM daily_summaries
+    WHERE date IN (OLD.date, NEW.date)
+    GROUP BY date, COALESCE(project_api_key, '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_summaries_rollup_delete
+AFTER DELETE ON daily_summaries
+BEGIN
+    DELETE FROM mv_project_daily WHERE date = OLD.date;
+    INSERT INTO mv_project_daily (date, project_api_key, hours, commits)
+    SELECT date, COALESCE(project_api_key, ''), SUM(total_dev_hours), SUM(total_commits)
+    FROM daily_summaries
+    WHERE date = OLD.date
+    GROUP BY date, COALESCE(project_api_key, '');
+END;
+
+-- Backfill the rollup for databases created before it existed
+INSERT INTO mv_project_daily (date, project_api_key, hours, commits)
+SELECT date, COALESCE(project_api_key, ''), SUM(total_dev_hours), SUM(total_commits)
+FROM daily_summaries
+WHERE NOT EXISTS (SELECT 1 FROM mv_project_daily)
+GROUP BY date, COALESCE(project_api_key, '');
 
 -- Views for common queries
 
@@ -11,30 +11,171 @@ This MCP server provides tools for:
 """
 
 import os
+import asyncio
+import atexit
+import functools
+import hashlib
 import json
+import queue
 import sqlite3
 import subprocess
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import httpx
 from mcp.server import Server
-from mcp.types import Tool, TextContent
-from pydantic import BaseModel
+from mcp.types import TextContent
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib encoder
+    orjson = None
 
 # Configuration
 DB_PATH = os.environ.get("DEV_TRACKER_DB", Path.home() / "dev-tracker" / "dev_tracker.db")
 ROADMAP_API_BASE = "https://feedback.edwinlovett.com/roadmap/api/v1"
 ROADMAP_API_TOKEN = os.environ.get("ROADMAP_API_TOKEN", "")
 HOURLY_RATE = float(os.environ.get("DEV_TRACKER_HOURLY_RATE", "75"))
+MANUAL_MULTIPLIER = 2.5  # How much longer it would take without AI
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
 # Initialize MCP server
 server = Server("dev-tracker")
 
 
-def get_db_connection():
-    """Get SQLite database connection"""
-    return sqlite3.connect(DB_PATH)
+# Read connections in the pool; each keeps its own page cache
+POOL_SIZE = int(os.environ.get("DEV_TRACKER_POOL_SIZE", "4"))
+
+# Database-wide settings, applied by the writer connection
+WRITER_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+"""
+
+# Per-connection settings, applied to every connection in the pool
+CONNECTION_PRAGMAS = """
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA busy_timeout = 5000;
+"""
+
+
+class SqlitePool:
+    """One writer plus up to `size` read-only connections
+
+    WAL lets the readers run concurrently with each other and with the
+    writer, so tool calls only serialize on writes. Connections are opened
+    on first use and kept for the life of the process.
+    """
+
+    def __init__(self, path, size: int):
+        self.path = path
+        self.size = max(size, 1)
+        self._readers = queue.Queue()
+        self._opened = 0
+        self._writer = None
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False,
+                detect_types=sqlite3.PARSE_DECLTYPES
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None,
+                detect_types=sqlite3.PARSE_DECLTYPES
+            )
+            conn.executescript(WRITER_PRAGMAS)
+        conn.executescript(CONNECTION_PRAGMAS)
+        conn.row_factory = dict_factory
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        # The writer creates the database and switches it to WAL, so it is
+        # opened before any reader
+        with self._open_lock:
+            if self._writer is None:
+                self._writer = self._connect(readonly=False)
+            return self._writer
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection, opening one if the pool has room"""
+        self._get_writer()
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._open_lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect(readonly=True) if can_open else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """Hold the writer connection (autocommit) for exclusive use"""
+        conn = self._get_writer()
+        with self._write_lock:
+            yield conn
+
+    def close(self):
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_repo(cwd: str) -> str:
+    """Get the git toplevel for a directory, or the directory itself
+
+    Cached per directory so tools don't spawn git on every call.
+    """
+    return subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"],
+        capture_output=True, text=True, cwd=cwd
+    ).stdout.strip() or cwd
+
+
+def make_session_id(repo_path: str) -> str:
+    """Build the day's session ID for a repo
+
+    Matches get_session_id() in hooks/track.sh (md5 of `echo "$repo_path"`),
+    so a manually started session is the same row the hooks update.
+    """
+    digest = hashlib.md5(f"{repo_path}\n".encode(), usedforsecurity=False).hexdigest()
+    return f"session_{datetime.now().strftime('%Y%m%d')}_{digest[:8]}"
+
+
+def dump_json(data) -> str:
+    """Serialize a payload for a JSON column"""
+    if orjson:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def load_json(value: bytes):
+    """Parse a JSON column value"""
+    if orjson:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+# Columns declared JSON round-trip as Python objects: dict parameters are
+# stored with dump_json, and values read back are parsed with load_json
+sqlite3.register_adapter(dict, dump_json)
+sqlite3.register_converter("JSON", load_json)
 
 
 def dict_factory(cursor, row):
@@ -42,26 +183,82 @@ def dict_factory(cursor, row):
     return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
 
 
-def query_db(sql: str, params: tuple = ()) -> list:
+db_pool = SqlitePool(DB_PATH, POOL_SIZE)
+
+
+def init_db():
+    """Apply schema.sql (idempotent) so older databases get new indexes"""
+    if SCHEMA_PATH.exists():
+        with db_pool.writer() as conn:
+            conn.executescript(SCHEMA_PATH.read_text())
+
+
+def sum_column(rows: list, col: str):
+    """Sum a column over query rows, treating NULL as 0"""
+    return sum(row[col] or 0 for row in rows)
+
+
+def avg_column(rows: list, col: str) -> float:
+    """Average a column over query rows, skipping NULLs like SQL AVG()"""
+    values = [row[col] for row in rows if row[col] is not None]
+    return sum(values) / len(values) if values else 0
+
+
+def query_db(sql: str, params: tuple | dict = ()) -> list:
     """Execute a query and return results as list of dicts"""
-    conn = get_db_connection()
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-
-def execute_db(sql: str, params: tuple = ()) -> int:
-    """Execute a write query and return last row id"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-    conn.commit()
-    last_id = cursor.lastrowid
-    conn.close()
-    return last_id
+    with db_pool.reader() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def execute_db(sql: str | list, params: tuple = ()) -> int:
+    """Execute a write query and return last row id
+
+    Pass a list of (sql, params) pairs instead to run related writes in a
+    single transaction (one commit, one WAL sync).
+    """
+    statements = sql if isinstance(sql, list) else [(sql, params)]
+    with db_pool.writer() as conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for statement, statement_params in statements:
+                cursor.execute(statement, statement_params)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return cursor.lastrowid
+
+
+async def aquery_db(sql: str, params: tuple | dict = ()) -> list:
+    """query_db on a worker thread, so the MCP event loop keeps serving"""
+    return await asyncio.to_thread(query_db, sql, params)
+
+
+async def aexecute_db(sql: str | list, params: tuple = ()) -> int:
+    """execute_db on a worker thread, so the MCP event loop keeps serving"""
+    return await asyncio.to_thread(execute_db, sql, params)
+
+
+# Roadmap API client, created on first use and reused so requests share
+# keep-alive connections instead of a TLS handshake each
+_HTTP: httpx.AsyncClient | None = None
+
+
+def get_http() -> httpx.AsyncClient:
+    """Get the shared Roadmap API client"""
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = httpx.AsyncClient(
+            base_url=ROADMAP_API_BASE,
+            headers={
+                "Authorization": f"Bearer {ROADMAP_API_TOKEN}",
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        )
+    return _HTTP
 
 
 async def call_roadmap_api(method: str, endpoint: str, data: dict = None) -> dict:
@@ -69,22 +266,98 @@ async def call_roadmap_api(method: str, endpoint: str, data: dict = None) -> dic
     if not ROADMAP_API_TOKEN:
         return {"error": "ROADMAP_API_TOKEN not set"}
     
-    headers = {
-        "Authorization": f"Bearer {ROADMAP_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
+    if method not in ("GET", "POST"):
+        return {"error": f"Unsupported method: {method}"}
     
-    url = f"{ROADMAP_API_BASE}{endpoint}"
+    body = None
+    if data is not None:
+        body = orjson.dumps(data) if orjson else json.dumps(data).encode()
     
-    async with httpx.AsyncClient() as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        else:
-            return {"error": f"Unsupported method: {method}"}
-        
-        return response.json()
+    response = await get_http().request(method, endpoint, content=body)
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# =============================================================================
+# SQL
+# =============================================================================
+
+# Daily rows for one repo, newest first
+DAILY_SUMMARIES_SQL = """
+    SELECT * FROM daily_summaries 
+    WHERE repo_path = ? AND date >= date('now', ?)
+    ORDER BY date DESC
+"""
+
+
+# Latest commits for one repo
+RECENT_COMMITS_SQL = """
+    SELECT 
+        commit_hash,
+        message,
+        datetime(timestamp, 'unixepoch') as commit_time,
+        insertions,
+        deletions,
+        pushed_to_roadmap
+    FROM commits 
+    WHERE repo_path = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+
+# Minutes since the previous commit, for the same commits
+COMMIT_GAPS_SQL = """
+    SELECT 
+        commit_hash,
+        gap_minutes
+    FROM v_commit_gaps
+    WHERE repo_path = ?
+    ORDER BY commit_time DESC
+    LIMIT ?
+"""
+
+
+# Per-project stats for the ROI report, then one is_total row with the
+# overall totals and the derived ROI figures (constants bound by name)
+ROI_STATS_SQL = """
+    SELECT 
+        0 as is_total,
+        pm.project_name,
+        SUM(ds.total_dev_hours) as dev_hours,
+        SUM(ds.active_coding_hours) as active_hours,
+        SUM(ds.total_commits) as commits,
+        SUM(ds.total_insertions + ds.total_deletions) as lines_changed,
+        AVG(ds.commits_per_hour) as velocity,
+        NULL as manual_hours,
+        NULL as time_saved,
+        NULL as cost_savings
+    FROM daily_summaries ds
+    LEFT JOIN project_mappings pm ON ds.project_api_key = pm.project_api_key
+    WHERE ds.date >= date('now', :since)
+    GROUP BY pm.project_name
+    UNION ALL
+    SELECT 
+        1, NULL,
+        hours,
+        NULL,
+        commits,
+        lines,
+        NULL,
+        hours * :multiplier,
+        hours * :multiplier - hours,
+        (hours * :multiplier - hours) * :hourly_rate
+    FROM (
+        SELECT 
+            COALESCE(SUM(total_dev_hours), 0) as hours,
+            COALESCE(SUM(total_commits), 0) as commits,
+            COALESCE(SUM(total_insertions + total_deletions), 0) as lines
+        FROM daily_summaries
+        WHERE date >= date('now', :since)
+    )
+    ORDER BY is_total, dev_hours DESC
+"""
 
 
 # =============================================================================
@@ -104,15 +377,15 @@ async def list_roadmap_projects() -> list[TextContent]:
     
     projects = result.get("projects", [])
     
-    output = "# Roadmap Projects\n\n"
-    output += f"Total: {len(projects)} projects\n\n"
-    output += "| Project | Status | Version | Updates | API Key |\n"
-    output += "|---------|--------|---------|---------|----------|\n"
+    parts = ["# Roadmap Projects\n\n"]
+    parts.append(f"Total: {len(projects)} projects\n\n")
+    parts.append("| Project | Status | Version | Updates | API Key |\n")
+    parts.append("|---------|--------|---------|---------|----------|\n")
     
     for p in projects:
-        output += f"| {p['name']} | {p['status']} | {p.get('current_version', '-')} | {p.get('update_count', 0)} | `{p['api_key'][:8]}...` |\n"
+        parts.append(f"| {p['name']} | {p['status']} | {p.get('current_version', '-')} | {p.get('update_count', 0)} | `{p['api_key'][:8]}...` |\n")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -130,21 +403,21 @@ async def get_project_details(identifier: str) -> list[TextContent]:
     
     project = result.get("project", {})
     
-    output = f"# {project['name']}\n\n"
-    output += f"**Status:** {project['status']}\n"
-    output += f"**Version:** {project.get('current_version', 'N/A')}\n"
-    output += f"**API Key:** `{project['api_key']}`\n\n"
-    output += f"**Description:** {project.get('description', 'N/A')}\n\n"
+    parts = [f"# {project['name']}\n\n"]
+    parts.append(f"**Status:** {project['status']}\n")
+    parts.append(f"**Version:** {project.get('current_version', 'N/A')}\n")
+    parts.append(f"**API Key:** `{project['api_key']}`\n\n")
+    parts.append(f"**Description:** {project.get('description', 'N/A')}\n\n")
     
     updates = project.get("updates", [])
     if updates:
-        output += "## Recent Updates\n\n"
+        parts.append("## Recent Updates\n\n")
         for update in updates[:5]:
             date = update.get("update_date", update.get("created_at", ""))[:10]
             notes = update.get("raw_notes", "No notes")
-            output += f"- **{date}** [{update.get('status', 'N/A')}]: {notes[:100]}...\n"
+            parts.append(f"- **{date}** [{update.get('status', 'N/A')}]: {notes[:100]}...\n")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -173,9 +446,9 @@ async def push_project_update(
         return [TextContent(type="text", text=f"Error: {result['error']}")]
     
     # Log to sync table
-    execute_db(
+    await aexecute_db(
         "INSERT INTO roadmap_sync_log (project_api_key, sync_type, payload, response_status) VALUES (?, ?, ?, ?)",
-        (project_identifier, "update", json.dumps(data), 200)
+        (project_identifier, "update", data, 200)
     )
     
     output = f"✅ Update pushed to **{result.get('project_name', project_identifier)}**\n\n"
@@ -199,55 +472,43 @@ async def get_dev_stats(
         days: Number of days to look back (default 7)
     """
     if repo_path is None:
-        repo_path = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        ).stdout.strip() or os.getcwd()
+        repo_path = _resolve_repo(os.getcwd())
     
     # Get daily summaries
-    summaries = query_db("""
-        SELECT * FROM daily_summaries 
-        WHERE repo_path = ? AND date >= date('now', ?)
-        ORDER BY date DESC
-    """, (repo_path, f"-{days} days"))
-    
-    # Get totals
-    totals = query_db("""
-        SELECT 
-            SUM(total_dev_hours) as total_hours,
-            SUM(active_coding_hours) as active_hours,
-            SUM(total_commits) as commits,
-            SUM(total_insertions) as insertions,
-            SUM(total_deletions) as deletions,
-            AVG(commits_per_hour) as avg_commits_hr,
-            AVG(lines_per_hour) as avg_lines_hr
-        FROM daily_summaries 
-        WHERE repo_path = ? AND date >= date('now', ?)
-    """, (repo_path, f"-{days} days"))
-    
-    t = totals[0] if totals else {}
-    
-    output = f"# Development Stats\n\n"
-    output += f"**Repository:** `{repo_path}`\n"
-    output += f"**Period:** Last {days} days\n\n"
-    
-    output += "## Totals\n\n"
-    output += f"- **Dev Hours:** {t.get('total_hours', 0):.2f}\n"
-    output += f"- **Active Coding:** {t.get('active_hours', 0):.2f}\n"
-    output += f"- **Efficiency:** {(t.get('active_hours', 0) / max(t.get('total_hours', 1), 0.01) * 100):.1f}%\n"
-    output += f"- **Commits:** {t.get('commits', 0)}\n"
-    output += f"- **Lines Changed:** +{t.get('insertions', 0)} / -{t.get('deletions', 0)}\n"
-    output += f"- **Avg Commits/Hour:** {t.get('avg_commits_hr', 0):.2f}\n"
-    output += f"- **Avg Lines/Hour:** {t.get('avg_lines_hr', 0):.0f}\n\n"
+    summaries = await aquery_db(DAILY_SUMMARIES_SQL, (repo_path, f"-{days} days"))
+    
+    # Totals over the daily rows (one per day at most), no second query
+    t = {
+        "total_hours": sum_column(summaries, 'total_dev_hours'),
+        "active_hours": sum_column(summaries, 'active_coding_hours'),
+        "commits": sum_column(summaries, 'total_commits'),
+        "insertions": sum_column(summaries, 'total_insertions'),
+        "deletions": sum_column(summaries, 'total_deletions'),
+        "avg_commits_hr": avg_column(summaries, 'commits_per_hour'),
+        "avg_lines_hr": avg_column(summaries, 'lines_per_hour')
+    }
+    
+    parts = [f"# Development Stats\n\n"]
+    parts.append(f"**Repository:** `{repo_path}`\n")
+    parts.append(f"**Period:** Last {days} days\n\n")
+    
+    parts.append("## Totals\n\n")
+    parts.append(f"- **Dev Hours:** {t.get('total_hours', 0):.2f}\n")
+    parts.append(f"- **Active Coding:** {t.get('active_hours', 0):.2f}\n")
+    parts.append(f"- **Efficiency:** {(t.get('active_hours', 0) / max(t.get('total_hours', 1), 0.01) * 100):.1f}%\n")
+    parts.append(f"- **Commits:** {t.get('commits', 0)}\n")
+    parts.append(f"- **Lines Changed:** +{t.get('insertions', 0)} / -{t.get('deletions', 0)}\n")
+    parts.append(f"- **Avg Commits/Hour:** {t.get('avg_commits_hr', 0):.2f}\n")
+    parts.append(f"- **Avg Lines/Hour:** {t.get('avg_lines_hr', 0):.0f}\n\n")
     
     if summaries:
-        output += "## Daily Breakdown\n\n"
-        output += "| Date | Hours | Active | Commits | +/- | Commits/Hr |\n"
-        output += "|------|-------|--------|---------|-----|------------|\n"
+        parts.append("## Daily Breakdown\n\n")
+        parts.append("| Date | Hours | Active | Commits | +/- | Commits/Hr |\n")
+        parts.append("|------|-------|--------|---------|-----|------------|\n")
         for s in summaries:
-            output += f"| {s['date']} | {s['total_dev_hours']:.1f} | {s['active_coding_hours']:.1f} | {s['total_commits']} | +{s['total_insertions']}/-{s['total_deletions']} | {s['commits_per_hour']:.2f} |\n"
+            parts.append(f"| {s['date']} | {s['total_dev_hours']:.1f} | {s['active_coding_hours']:.1f} | {s['total_commits']} | +{s['total_insertions']}/-{s['total_deletions']} | {s['commits_per_hour']:.2f} |\n")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -263,51 +524,30 @@ async def get_recent_commits(
         limit: Number of commits to show
     """
     if repo_path is None:
-        repo_path = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        ).stdout.strip() or os.getcwd()
+        repo_path = _resolve_repo(os.getcwd())
     
-    commits = query_db("""
-        SELECT 
-            commit_hash,
-            message,
-            datetime(timestamp, 'unixepoch') as commit_time,
-            insertions,
-            deletions,
-            pushed_to_roadmap
-        FROM commits 
-        WHERE repo_path = ?
-        ORDER BY timestamp DESC
-        LIMIT ?
-    """, (repo_path, limit))
-    
-    gaps = query_db("""
-        SELECT 
-            commit_hash,
-            gap_minutes
-        FROM v_commit_gaps
-        WHERE repo_path = ?
-        ORDER BY commit_time DESC
-        LIMIT ?
-    """, (repo_path, limit))
+    # Independent reads, run concurrently on separate pool connections
+    commits, gaps = await asyncio.gather(
+        aquery_db(RECENT_COMMITS_SQL, (repo_path, limit)),
+        aquery_db(COMMIT_GAPS_SQL, (repo_path, limit))
+    )
     
     gap_map = {g['commit_hash']: g['gap_minutes'] for g in gaps}
     
-    output = f"# Recent Commits\n\n"
-    output += f"**Repository:** `{repo_path}`\n\n"
+    parts = [f"# Recent Commits\n\n"]
+    parts.append(f"**Repository:** `{repo_path}`\n\n")
     
-    output += "| Time | Message | Changes | Gap | Synced |\n"
-    output += "|------|---------|---------|-----|--------|\n"
+    parts.append("| Time | Message | Changes | Gap | Synced |\n")
+    parts.append("|------|---------|---------|-----|--------|\n")
     
     for c in commits:
         gap = gap_map.get(c['commit_hash'])
         gap_str = f"{gap:.0f}m" if gap else "-"
         synced = "✅" if c['pushed_to_roadmap'] else "❌"
         msg = c['message'][:40] + "..." if len(c['message']) > 40 else c['message']
-        output += f"| {c['commit_time']} | {msg} | +{c['insertions']}/-{c['deletions']} | {gap_str} | {synced} |\n"
+        parts.append(f"| {c['commit_time']} | {msg} | +{c['insertions']}/-{c['deletions']} | {gap_str} | {synced} |\n")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -327,12 +567,9 @@ async def link_repo_to_project(
         auto_push: Whether to auto-push updates on commits
     """
     if repo_path is None:
-        repo_path = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        ).stdout.strip() or os.getcwd()
+        repo_path = _resolve_repo(os.getcwd())
     
-    execute_db("""
+    await aexecute_db("""
         INSERT OR REPLACE INTO project_mappings 
         (repo_path, project_api_key, project_name, auto_push_updates)
         VALUES (?, ?, ?, ?)
@@ -352,20 +589,20 @@ async def get_linked_projects() -> list[TextContent]:
     """
     Show all repository-to-project mappings.
     """
-    mappings = query_db("SELECT * FROM project_mappings ORDER BY created_at DESC")
+    mappings = await aquery_db("SELECT * FROM project_mappings ORDER BY created_at DESC")
     
     if not mappings:
         return [TextContent(type="text", text="No projects linked yet. Use `link_repo_to_project` to link a repo.")]
     
-    output = "# Linked Projects\n\n"
-    output += "| Repository | Project | Auto-Push | API Key |\n"
-    output += "|------------|---------|-----------|----------|\n"
+    parts = ["# Linked Projects\n\n"]
+    parts.append("| Repository | Project | Auto-Push | API Key |\n")
+    parts.append("|------------|---------|-----------|----------|\n")
     
     for m in mappings:
         auto = "✅" if m['auto_push_updates'] else "❌"
-        output += f"| `{m['repo_path']}` | {m['project_name']} | {auto} | `{m['project_api_key'][:8]}...` |\n"
+        parts.append(f"| `{m['repo_path']}` | {m['project_name']} | {auto} | `{m['project_api_key'][:8]}...` |\n")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -378,19 +615,16 @@ async def log_session_start(repo_path: Optional[str] = None) -> list[TextContent
         repo_path: Path to the repository
     """
     if repo_path is None:
-        repo_path = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True, text=True
-        ).stdout.strip() or os.getcwd()
+        repo_path = _resolve_repo(os.getcwd())
     
-    session_id = f"session_{datetime.now().strftime('%Y%m%d')}_{hash(repo_path) % 100000000:08x}"
+    session_id = make_session_id(repo_path)
     ts = int(datetime.now().timestamp())
     
     # Get project mapping
-    mappings = query_db("SELECT project_api_key FROM project_mappings WHERE repo_path = ?", (repo_path,))
+    mappings = await aquery_db("SELECT project_api_key FROM project_mappings WHERE repo_path = ?", (repo_path,))
     project_key = mappings[0]['project_api_key'] if mappings else None
     
-    execute_db("""
+    await aexecute_db("""
         INSERT OR IGNORE INTO sessions (session_id, repo_path, project_api_key, started_at, status)
         VALUES (?, ?, ?, ?, 'active')
     """, (session_id, repo_path, project_key, ts))
@@ -410,12 +644,12 @@ async def log_session_end(session_id: Optional[str] = None) -> list[TextContent]
     ts = int(datetime.now().timestamp())
     
     if session_id:
-        execute_db("""
+        await aexecute_db("""
             UPDATE sessions SET ended_at = ?, status = 'completed'
             WHERE session_id = ? AND ended_at IS NULL
         """, (ts, session_id))
     else:
-        execute_db("""
+        await aexecute_db("""
             UPDATE sessions SET ended_at = ?, status = 'completed'
             WHERE ended_at IS NULL
             ORDER BY started_at DESC LIMIT 1
@@ -432,74 +666,53 @@ async def generate_roi_report(days: int = 30) -> list[TextContent]:
     Args:
         days: Number of days to analyze
     """
-    # Get aggregated stats
-    stats = query_db("""
-        SELECT 
-            pm.project_name,
-            SUM(ds.total_dev_hours) as dev_hours,
-            SUM(ds.active_coding_hours) as active_hours,
-            SUM(ds.total_commits) as commits,
-            SUM(ds.total_insertions + ds.total_deletions) as lines_changed,
-            AVG(ds.commits_per_hour) as velocity
-        FROM daily_summaries ds
-        LEFT JOIN project_mappings pm ON ds.project_api_key = pm.project_api_key
-        WHERE ds.date >= date('now', ?)
-        GROUP BY pm.project_name
-        ORDER BY dev_hours DESC
-    """, (f"-{days} days",))
-    
-    totals = query_db("""
-        SELECT 
-            SUM(total_dev_hours) as total_hours,
-            SUM(total_commits) as total_commits,
-            SUM(total_insertions + total_deletions) as total_lines
-        FROM daily_summaries
-        WHERE date >= date('now', ?)
-    """, (f"-{days} days",))
-    
-    t = totals[0] if totals else {}
-    
-    # Assumptions for ROI calculation (HOURLY_RATE from config/env)
-    MANUAL_MULTIPLIER = 2.5  # How much longer it would take without AI
-    
-    total_hours = t.get('total_hours', 0) or 0
-    estimated_manual_hours = total_hours * MANUAL_MULTIPLIER
-    time_saved = estimated_manual_hours - total_hours
-    cost_savings = time_saved * HOURLY_RATE
-    
-    output = f"# AI Development ROI Report\n\n"
-    output += f"**Period:** Last {days} days\n"
-    output += f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
-    
-    output += "## Executive Summary\n\n"
-    output += f"- **Total Dev Hours with AI:** {total_hours:.1f} hours\n"
-    output += f"- **Estimated Manual Hours:** {estimated_manual_hours:.1f} hours\n"
-    output += f"- **Time Saved:** {time_saved:.1f} hours\n"
-    output += f"- **Cost Savings:** ${cost_savings:,.2f}\n"
-    output += f"- **Efficiency Gain:** {((MANUAL_MULTIPLIER - 1) * 100):.0f}%\n\n"
+    # Per-project stats, then an is_total row with the totals and ROI figures
+    rows = await aquery_db(ROI_STATS_SQL, {
+        "since": f"-{days} days",
+        "multiplier": MANUAL_MULTIPLIER,
+        "hourly_rate": HOURLY_RATE
+    })
     
-    output += "## Productivity Metrics\n\n"
-    output += f"- **Total Commits:** {t.get('total_commits', 0)}\n"
-    output += f"- **Lines of Code Changed:** {t.get('total_lines', 0):,}\n"
-    output += f"- **Commits per Hour:** {(t.get('total_commits', 0) / max(total_hours, 1)):.2f}\n\n"
+    stats = rows[:-1]
+    t = rows[-1]
+    total_hours = t['dev_hours']
+    estimated_manual_hours = t['manual_hours']
+    time_saved = t['time_saved']
+    cost_savings = t['cost_savings']
+    
+    parts = [f"# AI Development ROI Report\n\n"]
+    parts.append(f"**Period:** Last {days} days\n")
+    parts.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+    
+    parts.append("## Executive Summary\n\n")
+    parts.append(f"- **Total Dev Hours with AI:** {total_hours:.1f} hours\n")
+    parts.append(f"- **Estimated Manual Hours:** {estimated_manual_hours:.1f} hours\n")
+    parts.append(f"- **Time Saved:** {time_saved:.1f} hours\n")
+    parts.append(f"- **Cost Savings:** ${cost_savings:,.2f}\n")
+    parts.append(f"- **Efficiency Gain:** {((MANUAL_MULTIPLIER - 1) * 100):.0f}%\n\n")
+    
+    parts.append("## Productivity Metrics\n\n")
+    parts.append(f"- **Total Commits:** {t['commits']}\n")
+    parts.append(f"- **Lines of Code Changed:** {t['lines_changed']:,}\n")
+    parts.append(f"- **Commits per Hour:** {(t['commits'] / max(total_hours, 1)):.2f}\n\n")
     
     if stats:
-        output += "## By Project\n\n"
-        output += "| Project | Hours | Commits | Lines | Velocity |\n"
-        output += "|---------|-------|---------|-------|----------|\n"
+        parts.append("## By Project\n\n")
+        parts.append("| Project | Hours | Commits | Lines | Velocity |\n")
+        parts.append("|---------|-------|---------|-------|----------|\n")
         for s in stats:
             name = s['project_name'] or 'Unlinked'
-            output += f"| {name} | {s['dev_hours']:.1f} | {s['commits']} | {s['lines_changed']:,} | {s['velocity']:.2f}/hr |\n"
+            parts.append(f"| {name} | {s['dev_hours']:.1f} | {s['commits']} | {s['lines_changed']:,} | {s['velocity']:.2f}/hr |\n")
     
-    output += "\n## Formulas Used\n\n"
-    output += "```\n"
-    output += "Time Saved = (Dev Hours × Manual Multiplier) - Dev Hours\n"
-    output += "Cost Savings = Time Saved × Hourly Rate\n"
-    output += f"Manual Multiplier = {MANUAL_MULTIPLIER}x (industry standard for AI-assisted development)\n"
-    output += f"Hourly Rate = ${HOURLY_RATE}\n"
-    output += "```"
+    parts.append("\n## Formulas Used\n\n")
+    parts.append("```\n")
+    parts.append("Time Saved = (Dev Hours × Manual Multiplier) - Dev Hours\n")
+    parts.append("Cost Savings = Time Saved × Hourly Rate\n")
+    parts.append(f"Manual Multiplier = {MANUAL_MULTIPLIER}x (industry standard for AI-assisted development)\n")
+    parts.append(f"Hourly Rate = ${HOURLY_RATE}\n")
+    parts.append("```")
     
-    return [TextContent(type="text", text=output)]
+    return [TextContent(type="text", text="".join(parts))]
 
 
 @server.tool()
@@ -516,9 +729,9 @@ async def push_commit_to_roadmap(
     """
     # Get commit from DB or git
     if commit_hash:
-        commits = query_db("SELECT * FROM commits WHERE commit_hash = ?", (commit_hash,))
+        commits = await aquery_db("SELECT * FROM commits WHERE commit_hash = ?", (commit_hash,))
     else:
-        commits = query_db("SELECT * FROM commits ORDER BY timestamp DESC LIMIT 1")
+        commits = await aquery_db("SELECT * FROM commits ORDER BY timestamp DESC LIMIT 1")
     
     if not commits:
         return [TextContent(type="text", text="❌ No commits found")]
@@ -533,16 +746,22 @@ async def push_commit_to_roadmap(
     if include_stats:
         notes += f"\n\n+{commit['insertions']} / -{commit['deletions']} lines changed"
     
-    result = await call_roadmap_api("POST", f"/projects/{project_key}/updates", {
+    data = {
         "notes": notes,
         "status": "In Progress"
-    })
+    }
+    
+    result = await call_roadmap_api("POST", f"/projects/{project_key}/updates", data)
     
     if "error" in result:
         return [TextContent(type="text", text=f"❌ Error: {result['error']}")]
     
-    # Mark as pushed
-    execute_db("UPDATE commits SET pushed_to_roadmap = 1 WHERE commit_hash = ?", (commit['commit_hash'],))
+    # Log to sync table and mark as pushed, in one transaction
+    await aexecute_db([
+        ("INSERT INTO roadmap_sync_log (project_api_key, sync_type, payload, response_status) VALUES (?, ?, ?, ?)",
+         (project_key, "commit", data, 200)),
+        ("UPDATE commits SET pushed_to_roadmap = 1 WHERE commit_hash = ?", (commit['commit_hash'],))
+    ])
     
     return [TextContent(type="text", text=f"✅ Pushed commit `{commit['commit_hash'][:8]}` to {result.get('project_name', 'project')}")]
 
@@ -552,11 +771,16 @@ async def push_commit_to_roadmap(
 # =============================================================================
 
 if __name__ == "__main__":
-    import asyncio
     from mcp.server.stdio import stdio_server
     
+    init_db()
+
     async def main():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, server.create_initialization_options())
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+        finally:
+            if _HTTP is not None:
+                await _HTTP.aclose()
     
     asyncio.run(main())
@@ -13,13 +13,15 @@ echo "🚀 Setting up Development Tracker..."
 mkdir -p "$TRACKER_DIR/hooks"
 mkdir -p "$TRACKER_DIR/logs"
 
-# Initialize database
+# Initialize database (schema.sql is idempotent, so re-running it upgrades
+# an existing database with any new tables, indexes and triggers)
 if [ ! -f "$DB_PATH" ]; then
     echo "📦 Initializing database..."
     sqlite3 "$DB_PATH" < "$TRACKER_DIR/schema.sql"
     echo "✅ Database created at $DB_PATH"
 else
-    echo "✅ Database already exists"
+    sqlite3 "$DB_PATH" < "$TRACKER_DIR/schema.sql"
+    echo "✅ Database already exists (schema updated)"
 fi
 
 # Make hook script executable